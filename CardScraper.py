@@ -1,11 +1,5 @@
-import asyncio
-import nest_asyncio
-import re
-import json
-from playwright.async_api import async_playwright  # Async browser automation
-from DetailsScraper import DetailsScraping         # Custom scraper to extract card details
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+from urllib.parse import urljoin, urlsplit
+from DetailsScraper import DetailsScraping, launch_context, NEXT_DATA_SELECTOR  # Card details scraper + shared browser helpers
 
 class CardScraper:
     def __init__(self, url):
@@ -14,10 +8,11 @@ class CardScraper:
 
     # Main scraping function to get brands and their associated card types
     async def scrape_brands_and_types(self):
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)  # Launch headless browser (no UI)
-            page = await browser.new_page()  # Create a new tab
-            await page.goto(self.url)  # Navigate to the given category URL
+        # Launch one headless browser for the whole run; it is closed even if scraping fails
+        async with launch_context() as context:
+            page = await context.new_page()  # Create a new tab
+            await page.goto(self.url, wait_until="commit", timeout=15000)  # Navigate to the given category URL
+            await page.wait_for_selector(NEXT_DATA_SELECTOR, state="attached")  # Brand cards are parsed by now
 
             # Select all anchor tags inside brand cards
             brand_elements = await page.query_selector_all('.styles_itemWrapper__MTzPB a')
@@ -27,39 +22,34 @@ class CardScraper:
                 print(f"No brand elements found on {self.url}")
                 return self.data
 
+            # Scheme and domain of the category URL, used to resolve relative brand links
+            parts = urlsplit(self.url)
+            base_url = f"{parts.scheme}://{parts.netloc}"
+
             # Loop through each brand element
             for element in brand_elements:
                 title = await element.get_attribute('title')         # Get the brand name/title
                 brand_link = await element.get_attribute('href')     # Get the relative or absolute link
 
                 if brand_link:
-                    # Build the full URL by extracting scheme and domain from original URL
-                    base_url = self.url.split('/', 3)[0] + '//' + self.url.split('/', 3)[2]
                     # Construct full URL in case it's a relative path
-                    full_brand_link = base_url + brand_link if brand_link.startswith('/') else brand_link
+                    full_brand_link = urljoin(base_url, brand_link)
 
                     # Debug: Print full link to this brand's page
                     print(f"Full brand link: {full_brand_link}")
 
-                    # Open a new tab for this brand to extract its cards
-                    new_page = await browser.new_page()
-                    await new_page.goto(full_brand_link)
-
-                    # Use DetailsScraping class to extract card-level details for this brand
-                    details_scraper = DetailsScraping(full_brand_link)
-                    card_details = await details_scraper.get_card_details()  # Custom method in your scraper
-                    await new_page.close()  # Close tab after scraping
+                    # Use DetailsScraping class to extract card-level details for this brand (it loads the page itself)
+                    details_scraper = DetailsScraping(full_brand_link, context=context)
+                    card_details = [card async for card in details_scraper.get_card_details()]  # Custom method in your scraper
 
                     # Store all extracted info in the data list
                     self.data.append({
                         'brand_title': title,  # The name of the brand
-                        'brand_link': full_brand_link.rsplit('/', 1)[0] + '/{}',  # Prepare paginated URL
+                        'brand_link': urljoin(full_brand_link, '{}'),  # Prepare paginated URL (last segment -> page number)
                         'available_cards': card_details,  # List of cards scraped from the brand page
                     })
 
                     # Debug: Print brand info
                     print(f"Found brand: {title}, Link: {full_brand_link}")
 
-            await browser.close()  # Close the browser after all brands are processed
-
         return self.data  # Return the list of all brands with their data
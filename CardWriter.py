@@ -0,0 +1,55 @@
+import gzip
+import json
+import xlsxwriter
+
+# File suffix for each supported output format
+SUFFIXES = {
+    'xlsx': '.xlsx',  # Excel sheet, one row per card
+    'jsonl': '.jsonl.gz',  # Gzipped JSON Lines, one card per line (much cheaper to write than xlsx)
+}
+
+
+# xlsxwriter only writes scalars; lists/dicts (details, specifications) are stored as their text form
+def cell_value(value):
+    return str(value) if isinstance(value, (list, dict, tuple)) else value
+
+
+class CardWriter:
+    def __init__(self, path, output_format='xlsx'):
+        if output_format not in SUFFIXES:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.path = path  # File the cards are streamed into
+        self.output_format = output_format  # One of SUFFIXES
+        self.workbook = None  # Opened on the first card, so empty categories leave no file behind
+        self.worksheet = None
+        self.stream = None  # Gzip text stream for jsonl output
+        self.headers = None  # Column order, taken from the first card's keys
+        self.rows = 0  # Data rows written so far
+
+    # Append one card as the next row; creates the file (and header row) on first use
+    def write(self, card):
+        if self.output_format == 'jsonl':
+            if self.stream is None:
+                self.stream = gzip.open(self.path, 'wt', encoding='utf-8')
+            self.stream.write(json.dumps(card, ensure_ascii=False, default=str) + "\n")
+            self.rows += 1
+            return
+
+        if self.workbook is None:
+            # constant_memory flushes each row to disk as soon as the next one starts
+            self.workbook = xlsxwriter.Workbook(str(self.path), {'constant_memory': True, 'strings_to_urls': False})
+            self.worksheet = self.workbook.add_worksheet()
+            self.headers = list(card)
+            self.worksheet.write_row(0, 0, self.headers)
+        self.rows += 1
+        self.worksheet.write_row(self.rows, 0, [cell_value(card.get(header)) for header in self.headers])
+
+    # Finish the file; returns its path, or None when no card was written
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+        elif self.workbook is not None:
+            self.workbook.close()
+        else:
+            return None
+        return str(self.path)
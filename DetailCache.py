@@ -0,0 +1,28 @@
+import asyncio
+from collections import OrderedDict
+
+
+class DetailCache:
+    def __init__(self, max_size=2048):
+        self.max_size = max_size  # Most card URLs kept; the least recently used one is dropped beyond this
+        self._tasks = OrderedDict()  # Card URL -> task scraping (or done scraping) its detail page
+
+    # Return the task for this link, starting it with fetch() on a miss; lookup and insert happen
+    # without an await in between, so concurrent scrapers of the same card share one detail-page visit
+    def get_or_start(self, link, fetch):
+        task = self._tasks.get(link)
+        if task is not None:
+            self._tasks.move_to_end(link)
+            return task
+        task = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda done: self._forget_failed(link, done))
+        self._tasks[link] = task
+        while len(self._tasks) > self.max_size:
+            self._tasks.popitem(last=False)
+        return task
+
+    # Failed, cancelled or empty scrapes are not kept, so the next card with this link tries again
+    def _forget_failed(self, link, task):
+        if task.cancelled() or task.exception() is not None or not task.result():
+            if self._tasks.get(link) is task:
+                del self._tasks[link]
@@ -1,133 +1,275 @@
 import pandas as pd
-import json
+try:
+    from orjson import loads as json_loads  # Several times faster on the large __NEXT_DATA__ payloads
+except ImportError:
+    from json import loads as json_loads
+import sys
 import asyncio
-import nest_asyncio
 import re
-from playwright.async_api import async_playwright
+import random
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright, Error as PlaywrightError  # Error also covers TimeoutError
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
+from PagePool import PagePool
+from DetailCache import DetailCache
+
+if "ipykernel" in sys.modules:
+    # Jupyter already runs a loop; allow nested event loops there (not needed, or imported, in scripts)
+    import nest_asyncio
+    nest_asyncio.apply()
+else:
+    # Scripts get uvloop when available: cheaper awaits for the many small Playwright calls
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+# Regex patterns compiled once at import instead of on every card
+_REL_TIME_RE = re.compile(r'(\d+)\s+(Second|Minute|Hour|Day|Month|شهر|ثانية|دقيقة|ساعة|يوم)', re.IGNORECASE)
+_REL_TIME_WORD_RE = re.compile(r'منذ|ساعة|يوم|دقيقة|شهر')  # Marks the "published since" entry
+_AD_ID_RE = re.compile(r'رقم الاعلان:\s*(\d+)')
+_AD_ID_ONLY_RE = re.compile(r'^رقم الاعلان: \d+$')
+_ADS_RE = re.compile(r'^\d+\s+(ads|اعلان|إعلان)$')
+_MEMBER_AR_RE = re.compile(r'^عضو منذ \D+\s+\d+$')
+_MEMBER_EN_RE = re.compile(r'^member since \D+\s+\d+$', re.IGNORECASE)
+
+# Reads all listing card fields at once instead of one query/inner_text round-trip per field
+_CARD_FIELDS_JS = """(card) => {
+    const text = (selector) => card.querySelector(selector)?.innerText ?? null;
+    return {
+        link: card.getAttribute('href'),
+        type: text('.text-6-med.text-neutral_600.styles_category__NQAci'),
+        title: text('.text-4-med.text-neutral_900.styles_title__l5TTA.undefined'),
+        pinned: card.querySelector('.StackedCard_tags__SsKrH > *') !== null,  // Any tag element means pinned
+    };
+}"""
+
+# Same idea for the single-element fields of a card details page
+_DETAIL_FIELDS_JS = """() => {
+    const text = (selector, root = document) => root.querySelector(selector)?.innerText ?? null;
+    const section = document.querySelector('.el-lvl-1.d-flex.align-items-center.justify-content-between.styles_sectionWrapper__v97PG');
+    return {
+        id_text: section ? text('.text-4-regular.m-text-5-med.text-neutral_600', section) : null,
+        description: document.querySelector('meta[name="description"]')?.getAttribute('content') ?? null,
+        image: document.querySelector('.styles_img__PC9G3')?.getAttribute('src') ?? null,
+        price: text('.h3.m-h5.text-prim_4sale_500'),
+        address: text('.text-4-regular.m-text-5-med.text-neutral_600'),
+        // Icon rows of the top section (views, relative publish date, ...), classified in Python
+        data_items: Array.from(document.querySelectorAll('.d-flex.align-items-center.styles_dataWithIcon__For9u')).map((item) => ({
+            text: item.innerText,
+            value: text('.text-5-regular.m-text-6-med.text-neutral_600', item),
+        })),
+    };
+}"""
+
+# Fields scrape_summary fills
+_SUMMARY_KEYS = ('id', 'description', 'image', 'price', 'address', 'views_no', 'relative_date')
+
+# Multi-element sections of a card details page, each read in one evaluate instead of a round-trip per element
+_ADDITIONAL_DETAILS_JS = """() => Array.from(
+    document.querySelectorAll('.styles_boolAttrs__Ce6YV .styles_boolAttr__Fkh_j div'),
+    (el) => el.innerText,
+)"""
+
+_SPECIFICATIONS_JS = """() => Array.from(
+    document.querySelectorAll('.styles_attrs__PX5Fs .styles_attr__BN3w_'),
+    (el) => ({
+        alt: el.querySelector('img')?.getAttribute('alt') ?? null,
+        value: el.querySelector('.text-4-med.m-text-5-med.text-neutral_900')?.innerText ?? null,
+    }),
+)"""
+
+_SUBMITTER_JS = """() => {
+    const wrapper = document.querySelector('.styles_infoWrapper__v4P8_.undefined.align-items-center');
+    if (!wrapper) return null;
+    return {
+        submitter: wrapper.querySelector('.text-4-med.m-h6.text-neutral_900')?.innerText ?? null,
+        texts: Array.from(wrapper.querySelectorAll('.styles_memberDate__qdUsm span.text-neutral_600'), (el) => el.innerText),
+    };
+}"""
+
+# Next.js embeds this script at the end of the server-rendered body, so once it is attached the markup above it is parsed
+NEXT_DATA_SELECTOR = 'script#__NEXT_DATA__'
+
+# Resource types the scraper never reads; img src attributes are still in the DOM when the image request is aborted
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Third-party analytics/ad hosts that only add bandwidth
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net", "hotjar.com")
+
+# Flags for running Chromium in CI/containers where /dev/shm is small
+CHROMIUM_ARGS = ['--disable-dev-shm-usage']
+
+
+# Exponential backoff with jitter between retries of a failed navigation (1s, 2s, 4s, ... capped at 30s)
+def retry_delay(attempt):
+    return min(30, 2 ** attempt + random.random())
+
+
+# Abort requests for assets and trackers so navigations only move the HTML and scripts
+async def _block_heavy_resources(route):
+    request = route.request
+    # Match the host itself or its subdomains, not any URL that merely mentions it (e.g. in a query string)
+    hostname = urlsplit(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        hostname == host or hostname.endswith("." + host) for host in BLOCKED_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Install the resource blocker on a browser context (covers all of its tabs) or a single page
+async def block_heavy_resources(target):
+    await target.route("**/*", _block_heavy_resources)
+
+
+# Launch headless Chromium and yield a browser context that is closed even if scraping fails.
+# No persistent profile: the context routes every request to block heavy resources, and
+# Playwright disables the HTTP cache for routed contexts, so a saved profile wouldn't speed anything up.
+@asynccontextmanager
+async def launch_context(headless=True):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless, args=CHROMIUM_ARGS)
+        try:
+            context = await browser.new_context()
+            await block_heavy_resources(context)
+            yield context
+        finally:
+            await browser.close()  # Also closes the context and its tabs
 
-# Apply nested event loops (mainly for interactive environments like Jupyter)
-nest_asyncio.apply()
 
 class DetailsScraping:
-    def __init__(self, url, retries=3):
+    def __init__(self, url, retries=3, context=None, max_pages=8, detail_cache=None, pool=None):
         self.url = url  # Target page to scrape
         self.retries = retries  # Retry attempts for scraping robustness
+        self.context = context  # Shared browser context; one is launched per call if not given
+        self.max_pages = max_pages  # Card detail tabs scraped concurrently
+        # Card URL -> detail scrape; pass the run's DetailCache so a card repeated across listing pages is opened once
+        self.detail_cache = DetailCache() if detail_cache is None else detail_cache
+        self.pool = pool  # PagePool shared with other scrapers; a private one (max_pages tabs) is used if not given
 
-    # Main method to scrape all card details from a page
+    # Main method to scrape all card details from a page; yields each card as soon as its detail page is done
     async def get_card_details(self):
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)  # Headless browser
-            page = await browser.new_page()
-
-            # Set browser timeouts
-            page.set_default_navigation_timeout(30000)
-            page.set_default_timeout(30000)
+        if self.context is None:
+            # Standalone use: launch a single browser for this page and all of its cards
+            async with launch_context() as context:
+                self.context = context
+                try:
+                    async for card in self.get_card_details():
+                        yield card
+                finally:
+                    self.context = None
+            return
 
-            cards = []  # Result list
+        page = await self._new_listing_page()
+        # Tabs reused across card detail pages
+        pool = self.pool if self.pool is not None else PagePool(self.context, max_pages=self.max_pages)
+        seen_links = set()  # Cards already yielded, so a retried page doesn't repeat them
 
-            # Retry loop
+        # Retry loop: only navigation timeouts / network errors are retried, anything else is raised
+        try:
             for attempt in range(self.retries):
                 try:
-                    await page.goto(self.url, wait_until="domcontentloaded")  # Navigate
-                    await page.wait_for_selector('.StackedCard_card__Kvggc')  # Ensure cards are loaded
+                    # Return as soon as the response starts; the selector waits below are the real barrier
+                    await page.goto(self.url, wait_until="commit", timeout=15000)
+                    await page.wait_for_selector(NEXT_DATA_SELECTOR, state="attached")
+                    await page.wait_for_selector('.StackedCard_card__Kvggc', state="attached")  # Ensure cards are loaded
 
                     card_cards = await page.query_selector_all('.StackedCard_card__Kvggc')  # List of cards
-                    for card in card_cards:
-                        link = await self.scrape_link(card)
-                        card_type = await self.scrape_card_type(card)
-                        title = await self.scrape_title(card)
-                        pinned_today = await self.scrape_pinned_today(card)
-
-                        # Get detailed info by opening card link
-                        scrape_more_details = await self.scrape_more_details(link)
-
-                        cards.append({
-                            'id': scrape_more_details.get('id'),
-                            'date_published': scrape_more_details.get('date_published'),
-                            'relative_date': scrape_more_details.get('relative_date'),
-                            'pin': pinned_today,
-                            'type': card_type,
-                            'title': title,
-                            'description': scrape_more_details.get('description'),
-                            'link': link,
-                            'image': scrape_more_details.get('image'),
-                            'price': scrape_more_details.get('price'),
-                            'address': scrape_more_details.get('address'),
-                            'additional_details': scrape_more_details.get('additional_details'),
-                            'specifications': scrape_more_details.get('specifications'),
-                            'views_no': scrape_more_details.get('views_no'),
-                            'submitter': scrape_more_details.get('submitter'),
-                            'ads': scrape_more_details.get('ads'),
-                            'membership': scrape_more_details.get('membership'),
-                            'phone': scrape_more_details.get('phone'),
-                        })
+                    # Scrape all card detail pages concurrently (bounded by the page pool), in completion order
+                    tasks = [asyncio.ensure_future(self._process_card(card, pool)) for card in card_cards]
+                    try:
+                        for next_card in asyncio.as_completed(tasks):
+                            try:
+                                card = await next_card
+                            except Exception as e:
+                                print(f"Failed to scrape card on {self.url}: {e}")
+                                continue
+                            if card['link'] is None or card['link'] not in seen_links:
+                                seen_links.add(card['link'])
+                                yield card
+                    finally:
+                        # Consumer stopped early or the page failed: don't leave detail scrapes running
+                        for task in tasks:
+                            task.cancel()
                     break  # Exit on success
-                except Exception as e:
+                except PlaywrightError as e:
                     print(f"Attempt {attempt + 1} failed for {self.url}: {e}")
                     if attempt + 1 == self.retries:
-                        print(f"Max retries reached for {self.url}. Returning partial results.")
+                        print(f"Max retries reached for {self.url}. Keeping the cards scraped so far.")
                         break
-                finally:
+                    # Back off before retrying on a fresh tab
                     await page.close()
-                    if attempt + 1 < self.retries:
-                        page = await browser.new_page()
-
-            await browser.close()
-            return cards
-
-    # Extracts the link of a listing card
-    async def scrape_link(self, card):
-        rawlink = await card.get_attribute('href')
+                    await asyncio.sleep(retry_delay(attempt))
+                    page = await self._new_listing_page()
+        finally:
+            await page.close()
+            if pool is not self.pool:
+                await pool.close()  # A shared pool is closed by its owner
+
+    # Opens a tab for the listing page with the scraper's timeouts
+    async def _new_listing_page(self):
+        page = await self.context.new_page()
+        page.set_default_navigation_timeout(30000)
+        page.set_default_timeout(30000)
+        return page
+
+    # Scrapes one listing card plus its detail page on a tab borrowed from the pool
+    async def _process_card(self, card, pool):
+        card_fields = await self.scrape_card(card)
+        link = card_fields['link']
+
+        # Get detailed info by opening card link, or join the scrape already started (or done) for it in this run.
+        # Shielded: cancelling this card must not cancel a scrape other cards with the same link are waiting on
+        scrape_more_details = await asyncio.shield(
+            self.detail_cache.get_or_start(link, lambda: self._fetch_details(link, pool))
+        )
+
+        return {
+            'id': scrape_more_details.get('id'),
+            'date_published': scrape_more_details.get('date_published'),
+            'relative_date': scrape_more_details.get('relative_date'),
+            'pin': card_fields['pin'],
+            'type': card_fields['type'],
+            'title': card_fields['title'],
+            'description': scrape_more_details.get('description'),
+            'link': link,
+            'image': scrape_more_details.get('image'),
+            'price': scrape_more_details.get('price'),
+            'address': scrape_more_details.get('address'),
+            'additional_details': scrape_more_details.get('additional_details'),
+            'specifications': scrape_more_details.get('specifications'),
+            'views_no': scrape_more_details.get('views_no'),
+            'submitter': scrape_more_details.get('submitter'),
+            'ads': scrape_more_details.get('ads'),
+            'membership': scrape_more_details.get('membership'),
+            'phone': scrape_more_details.get('phone'),
+        }
+
+    # Opens the card link in a pooled tab and scrapes its details
+    async def _fetch_details(self, link, pool):
+        async with pool.acquire() as detail_page:
+            return await self.scrape_more_details(link, detail_page)
+
+    # Extracts link, type, title and pinned label of a listing card in a single round-trip
+    async def scrape_card(self, card):
+        data = await card.evaluate(_CARD_FIELDS_JS)
+        rawlink = data['link']
         base_url = 'https://www.q84sale.com'
-        return f"{base_url}{rawlink}" if rawlink else None
-
-    # Extracts the type/category of the listing (e.g., Prepaid Card)
-    async def scrape_card_type(self, card):
-        selector = '.text-6-med.text-neutral_600.styles_category__NQAci'
-        element = await card.query_selector(selector)
-        return await element.inner_text() if element else None
-
-    # Extracts the title of the listing
-    async def scrape_title(self, card):
-        selector = '.text-4-med.text-neutral_900.styles_title__l5TTA.undefined'
-        element = await card.query_selector(selector)
-        return await element.inner_text() if element else None
-
-    # Scrapes the label showing if the listing is "Pinned today"
-    async def scrape_pinned_today(self, card):
-        selector = '.StackedCard_tags__SsKrH'
-        element = await card.query_selector(selector)
-        if element:
-            content = await element.inner_html()
-            if content.strip() != "":
-                return "Pinned today"
-        return "Not Pinned"
-
-    # Extracts relative publish date (e.g., منذ ساعة)
-    async def scrape_relative_date(self, page):
-        try:
-            parent_locator = page.locator('.d-flex.styles_topData__Sx1GF')
-            await parent_locator.wait_for(state="visible", timeout=10000)
-
-            data_items = page.locator('.d-flex.align-items-center.styles_dataWithIcon__For9u')
-            items = await data_items.all()
-
-            for item in items:
-                text = await item.inner_text()
-                if any(word in text for word in ['منذ', 'ساعة', 'يوم', 'دقيقة', 'شهر']):
-                    time_element = await item.locator('.text-5-regular.m-text-6-med.text-neutral_600').inner_text()
-                    return time_element.strip()
-            return None
-        except Exception as e:
-            print(f"Error while scraping relative_date: {e}")
-            return None
+        return {
+            'link': f"{base_url}{rawlink}" if rawlink else None,
+            'type': data['type'],
+            'title': data['title'],
+            'pin': "Pinned today" if data['pinned'] else "Not Pinned",
+        }
 
     # Converts a relative Arabic time string into an absolute datetime
     async def scrape_publish_date(self, relative_time):
-        relative_time_pattern = r'(\d+)\s+(Second|Minute|Hour|Day|Month|شهر|ثانية|دقيقة|ساعة|يوم)'
-        match = re.search(relative_time_pattern, relative_time, re.IGNORECASE)
+        match = _REL_TIME_RE.search(relative_time)
         if not match:
             return "Invalid Relative Time"
 
@@ -150,101 +292,88 @@ class DetailsScraping:
 
         return publish_time.strftime("%Y-%m-%d %H:%M:%S")
 
-    # Scrapes number of views from the card details page
-    async def scrape_views_no(self, page):
-        try:
-            views_selector = '.d-flex.align-items-center.styles_dataWithIcon__For9u .text-5-regular.m-text-6-med.text-neutral_600'
-            views_element = await page.query_selector(views_selector)
-            return (await views_element.inner_text()).strip() if views_element else None
-        except Exception as e:
-            print(f"Error while scraping views number: {e}")
-            return None
-
-    # Scrapes the listing (ad) ID
-    async def scrape_id(self, page):
-        parent_selector = '.el-lvl-1.d-flex.align-items-center.justify-content-between.styles_sectionWrapper__v97PG'
-        parent_element = await page.query_selector(parent_selector)
-        ad_id_selector = '.text-4-regular.m-text-5-med.text-neutral_600'
-        ad_id_element = await parent_element.query_selector(ad_id_selector) if parent_element else None
-        text = await ad_id_element.inner_text() if ad_id_element else ""
-        match = re.search(r'رقم الاعلان:\s*(\d+)', text)
-        return match.group(1) if match else None
-
-    # Scrapes main image src of the listing
-    async def scrape_image(self, page):
-        try:
-            image_selector = '.styles_img__PC9G3'
-            image = await page.query_selector(image_selector)
-            return await image.get_attribute('src') if image else None
-        except Exception as e:
-            print(f"Error scraping image: {e}")
-            return None
-
-    # Scrapes price (e.g., "20 KWD")
-    async def scrape_price(self, page):
-        price_selector = '.h3.m-h5.text-prim_4sale_500'
-        price = await page.query_selector(price_selector)
-        return await price.inner_text() if price else "0 KWD"
-
-    # Scrapes address of the seller (e.g., "Salmiya")
-    async def scrape_address(self, page):
-        address_selector = '.text-4-regular.m-text-5-med.text-neutral_600'
-        address = await page.query_selector(address_selector)
-        if address:
-            text = await address.inner_text()
-            if re.match(r'^رقم الاعلان: \d+$', text):
-                return "Not Mentioned"
-            return text
-        return "Not Mentioned"
-
-    # Scrapes list of additional attributes (x1, imported, etc.)
+    # Scrapes id, description, image, price, address, views and relative date of a card details page in one round-trip
+    async def scrape_summary(self, page):
+        data = await page.evaluate(_DETAIL_FIELDS_JS)
+
+        # The icon row mentioning a time unit is the relative publish date (e.g., منذ ساعة), the first numeric one is views
+        views, relative = None, None
+        for item in data['data_items']:
+            value = (item['value'] or "").strip()
+            if not value:
+                continue
+            if relative is None and _REL_TIME_WORD_RE.search(item['text']):
+                relative = value
+            elif views is None and any(ch.isdigit() for ch in value):
+                views = value
+
+        # Listing (ad) ID, e.g. "رقم الاعلان: 123456"
+        match = _AD_ID_RE.search(data['id_text'] or "")
+
+        # Seller address (e.g., "Salmiya"); it shares its style with the ad ID, which shows up here when no address is given
+        address = data['address']
+        if address is None or _AD_ID_ONLY_RE.match(address):
+            address = "Not Mentioned"
+
+        return {
+            'id': match.group(1) if match else None,
+            'description': data['description'],
+            'image': data['image'],
+            'price': data['price'] if data['price'] is not None else "0 KWD",
+            'address': address,
+            'views_no': views,
+            'relative_date': relative,
+        }
+
+    # Scrapes list of additional attributes (x1, imported, etc.) in one round-trip
     async def scrape_additionalDetails_list(self, page):
-        selector = '.styles_boolAttrs__Ce6YV .styles_boolAttr__Fkh_j div'
-        elements = await page.query_selector_all(selector)
-        return [await e.inner_text() for e in elements if (await e.inner_text()).strip()]
+        texts = await page.evaluate(_ADDITIONAL_DETAILS_JS)
+        return [text for text in texts if text.strip()]
 
-    # Scrapes specification key-value pairs (e.g., RAM: 4GB)
+    # Scrapes specification key-value pairs (e.g., RAM: 4GB) in one round-trip
     async def scrape_specifications(self, page):
-        selector = '.styles_attrs__PX5Fs .styles_attr__BN3w_'
-        elements = await page.query_selector_all(selector)
         attributes = {}
-        for element in elements:
-            img = await element.query_selector('img')
-            text_el = await element.query_selector('.text-4-med.m-text-5-med.text-neutral_900')
-            alt = await img.get_attribute('alt') if img else None
-            val = await text_el.inner_text() if text_el else None
-            if alt and val:
-                attributes[alt] = val.strip()
+        for item in await page.evaluate(_SPECIFICATIONS_JS):
+            if item['alt'] and item['value']:
+                attributes[item['alt']] = item['value'].strip()
         return attributes
 
-    # Extract phone number from embedded JSON structure
-    async def scrape_phone_number(self, page):
+    # Reads the listing payload Next.js embeds in the page, parsed once per card
+    async def scrape_listing_data(self, page):
         try:
-            script_content = await page.inner_html('script#__NEXT_DATA__')
+            script_content = await page.inner_html(NEXT_DATA_SELECTOR)
             if script_content:
-                data = json.loads(script_content.strip())
-                return data.get("props", {}).get("pageProps", {}).get("listing", {}).get("phone", None)
+                data = json_loads(script_content.strip())
+                return data.get("props", {}).get("pageProps", {}).get("listing") or {}
         except Exception as e:
-            print(f"Error while scraping phone number: {e}")
-        return None
+            print(f"Error while reading listing data: {e}")
+        return {}
 
-    # Scrapes submitter info: name, ads count, membership
+    # Maps the embedded listing payload onto card fields; anything it doesn't carry stays None
+    def parse_listing_data(self, listing):
+        location = listing.get('location')
+        photos = listing.get('photos') or listing.get('images') or []
+        photo = photos[0] if isinstance(photos, list) and photos else None
+        return {
+            'id': str(listing['id']) if listing.get('id') is not None else None,
+            'description': listing.get('description'),
+            'image': photo.get('url') if isinstance(photo, dict) else photo,
+            'address': location.get('name') if isinstance(location, dict) else None,
+            'phone': listing.get('phone'),
+        }
+
+    # Scrapes submitter info: name, ads count, membership in one round-trip
     async def scrape_submitter_details(self, page):
-        info_wrapper_selector = '.styles_infoWrapper__v4P8_.undefined.align-items-center'
-        info_wrappers = await page.query_selector_all(info_wrapper_selector)
-
-        if info_wrappers:
-            submitter_element = await info_wrappers[0].query_selector('.text-4-med.m-h6.text-neutral_900')
-            submitter = await submitter_element.inner_text() if submitter_element else None
+        info = await page.evaluate(_SUBMITTER_JS)
 
-            detail_elements = await info_wrappers[0].query_selector_all('.styles_memberDate__qdUsm span.text-neutral_600')
+        if info:
+            submitter = info['submitter']
             ads, membership = "0 ads", "membership year not mentioned"
 
-            for el in detail_elements:
-                text = await el.inner_text()
-                if re.match(r'^\d+\s+(ads|اعلان|إعلان)$', text):
+            for text in info['texts']:
+                if _ADS_RE.match(text):
                     ads = text
-                elif re.match(r'^عضو منذ \D+\s+\d+$', text) or re.match(r'^member since \D+\s+\d+$', text, re.IGNORECASE):
+                elif _MEMBER_AR_RE.match(text) or _MEMBER_EN_RE.match(text):
                     membership = text
 
             return {
@@ -254,50 +383,44 @@ class DetailsScraping:
             }
         return {}
 
-    # Consolidates all sub-scraping for a card detail page
-    async def scrape_more_details(self, url):
-        for attempt in range(3):
+    # Consolidates all sub-scraping for a card detail page, loaded into the given tab
+    async def scrape_more_details(self, url, page):
+        for attempt in range(self.retries):
             try:
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True)
-                    page = await browser.new_page()
-                    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-
-                    id = await self.scrape_id(page)
-                    description = await self.scrape_description(page)
-                    image = await self.scrape_image(page)
-                    price = await self.scrape_price(page)
-                    address = await self.scrape_address(page)
-                    additional = await self.scrape_additionalDetails_list(page)
-                    specs = await self.scrape_specifications(page)
-                    views = await self.scrape_views_no(page)
+                await page.goto(url, wait_until="commit", timeout=15000)
+                await page.wait_for_selector(NEXT_DATA_SELECTOR, state="attached")
+
+                # The embedded JSON first; each DOM scraper below only runs if a field it covers is still missing
+                listing = self.parse_listing_data(await self.scrape_listing_data(page))
+                details = {key: value for key, value in listing.items() if value is not None}
+
+                def missing(*keys):
+                    return any(key not in details for key in keys)
+
+                # The payload carries no price, views or relative date, so in practice this one always runs
+                if missing(*_SUMMARY_KEYS):
+                    for key, value in (await self.scrape_summary(page)).items():
+                        details.setdefault(key, value)
+                if missing('additional_details'):
+                    details['additional_details'] = await self.scrape_additionalDetails_list(page)
+                if missing('specifications'):
+                    details['specifications'] = await self.scrape_specifications(page)
+                if missing('submitter', 'ads', 'membership'):
                     submitter = await self.scrape_submitter_details(page)
-                    phone = await self.scrape_phone_number(page)
-                    relative = await self.scrape_relative_date(page)
-                    published = await self.scrape_publish_date(relative) if relative else None
-
-                    await browser.close()
-                    return {
-                        'id': id,
-                        'description': description,
-                        'image': image,
-                        'price': price,
-                        'address': address,
-                        'additional_details': additional,
-                        'specifications': specs,
-                        'views_no': views,
-                        'submitter': submitter.get('submitter'),
-                        'ads': submitter.get('ads'),
-                        'membership': submitter.get('membership'),
-                        'phone': phone,
-                        'relative_date': relative,
-                        'date_published': published,
-                    }
-
-            except Exception as e:
+                    for key in ('submitter', 'ads', 'membership'):
+                        details.setdefault(key, submitter.get(key))
+                details.setdefault('phone', None)
+
+                relative = details.get('relative_date')
+                details['date_published'] = await self.scrape_publish_date(relative) if relative else None
+                return details
+
+            except PlaywrightError as e:
+                # Timeouts and net::ERR_* failures are transient; anything else is a real bug and is raised
                 print(f"Error while scraping more details from {url}: {e}")
-                if attempt + 1 == 3:
+                if attempt + 1 == self.retries:
                     print(f"Max retries reached for {url}. Returning partial results.")
                     return {}
+                await asyncio.sleep(retry_delay(attempt))
 
         return {}
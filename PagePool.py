@@ -0,0 +1,34 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class PagePool:
+    def __init__(self, context, max_pages=8):
+        self.context = context  # Browser context that new tabs are opened on
+        self.max_pages = max_pages  # Upper bound on tabs open at the same time
+        self._free = deque()  # Idle tabs ready to be handed out again
+        self._semaphore = asyncio.Semaphore(max_pages)  # Caps concurrent users of the pool
+
+    # Hand out an idle tab, or open a new one while under max_pages
+    @asynccontextmanager
+    async def acquire(self):
+        async with self._semaphore:
+            page = None
+            while self._free and page is None:
+                candidate = self._free.pop()
+                if not candidate.is_closed():
+                    page = candidate
+            if page is None:
+                page = await self.context.new_page()
+            try:
+                yield page
+            finally:
+                # Crashed or closed tabs are dropped, the next acquire opens a fresh one
+                if not page.is_closed():
+                    self._free.append(page)
+
+    # Close every idle tab (call once all acquired pages have been released)
+    async def close(self):
+        while self._free:
+            await self._free.pop().close()
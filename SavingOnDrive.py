@@ -1,8 +1,14 @@
 import os
+import socket
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaFileUpload, build_http
 from datetime import datetime, timedelta
 
 class SavingOnDrive:
@@ -10,16 +16,24 @@ class SavingOnDrive:
         self.credentials_dict = credentials_dict  # Google service account credentials as a Python dict
         self.scopes = ['https://www.googleapis.com/auth/drive']  # Full access to Drive
         self.service = None  # Will hold authenticated Google Drive service
+        self.creds = None  # Service account credentials, shared by the per-thread HTTP transports
+        self._local = threading.local()  # Per-thread state (each upload thread gets its own transport)
+        self.max_upload_workers = 8  # Parallel uploads in save_files
+        self.resumable_threshold = 5 * 1024 * 1024  # Files above this size (bytes) use resumable uploads
+        self.chunk_size = 8 * 1024 * 1024  # Bytes sent per resumable upload request
+        self.chunk_retries = 5  # Transient failures tolerated per chunk before the upload is abandoned
         self.parent_folder_id = '1NqWSVrV95XdnCbZ5MCqVR-4O2JxCF3Up'  # ID of the parent folder on Drive
+        self._folder_id_cache = {}  # Folder name -> ID, so repeated lookups skip the Drive API
 
     def authenticate(self):
         """Authenticate with Google Drive API."""
         try:
             print("Authenticating with Google Drive...")
             # Authenticate using service account credentials and scopes
-            creds = Credentials.from_service_account_info(self.credentials_dict, scopes=self.scopes)
+            self.creds = Credentials.from_service_account_info(self.credentials_dict, scopes=self.scopes)
             # Build the Drive service client
-            self.service = build('drive', 'v3', credentials=creds)
+            self.service = build('drive', 'v3', credentials=self.creds)
+            self._local = threading.local()  # Drop transports bound to the old credentials
             print("Authentication successful.")
         except Exception as e:
             # Catch any authentication issues
@@ -28,6 +42,10 @@ class SavingOnDrive:
 
     def get_folder_id(self, folder_name):
         """Get folder ID by name within the parent folder."""
+        # Reuse IDs resolved (or created) earlier in this run
+        if folder_name in self._folder_id_cache:
+            return self._folder_id_cache[folder_name]
+
         try:
             # Build a query to search for the folder by name under the specified parent folder
             query = (f"name='{folder_name}' and "
@@ -47,6 +65,7 @@ class SavingOnDrive:
             if files:
                 # Return the ID of the first matching folder
                 print(f"Folder '{folder_name}' found with ID: {files[0]['id']}")
+                self._folder_id_cache[folder_name] = files[0]['id']
                 return files[0]['id']
             else:
                 print(f"Folder '{folder_name}' does not exist.")
@@ -72,12 +91,43 @@ class SavingOnDrive:
                 fields='id'
             ).execute()
             print(f"Folder '{folder_name}' created with ID: {folder.get('id')}")
+            self._folder_id_cache[folder_name] = folder.get('id')  # No re-lookup needed for the new folder
             return folder.get('id')
         except Exception as e:
             # Raise error if folder creation fails
             print(f"Error creating folder: {e}")
             raise
 
+    def _thread_http(self):
+        """Return this thread's authorized HTTP transport (httplib2 is not thread-safe)."""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            # build_http() keeps googleapiclient's defaults: 60 s socket timeout, 308 not followed as a redirect
+            http = AuthorizedHttp(self.creds, http=build_http())
+            self._local.http = http
+        return http
+
+    def _upload_chunks(self, request):
+        """Send a resumable upload chunk by chunk; a failed chunk resumes from the last acknowledged byte."""
+        response = None
+        failures = 0
+        while response is None:
+            try:
+                status, response = request.next_chunk(http=self._thread_http())
+                failures = 0
+                if status:
+                    print(f"Uploaded {int(status.progress() * 100)}%")
+            except (HttpError, socket.timeout, ConnectionError) as e:
+                # Rate limiting, server errors and stalled/dropped connections are worth resuming;
+                # anything else is final. The 308 between chunks is handled by build_http()'s transport.
+                failures += 1
+                if isinstance(e, HttpError) and e.resp.status not in (429, 500, 502, 503, 504):
+                    raise
+                if failures > self.chunk_retries:
+                    raise
+                time.sleep(min(30, 2 ** failures))
+        return response
+
     def upload_file(self, file_name, folder_id):
         """Upload a single file to Google Drive."""
         try:
@@ -87,14 +137,20 @@ class SavingOnDrive:
                 'name': os.path.basename(file_name),
                 'parents': [folder_id]
             }
-            # Wrap the file using MediaFileUpload for streaming upload
-            media = MediaFileUpload(file_name, resumable=True)
-            # Upload the file to Drive
-            file = self.service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id'
-            ).execute()
+            # Resumable sessions cost an extra handshake; only worth it for large files
+            size = os.path.getsize(file_name)
+            if size > self.resumable_threshold:
+                media = MediaFileUpload(file_name, resumable=True, chunksize=self.chunk_size)
+                request = self.service.files().create(body=file_metadata, media_body=media, fields='id')
+                file = self._upload_chunks(request)
+            else:
+                media = MediaFileUpload(file_name, resumable=False)
+                # Upload the file to Drive
+                file = self.service.files().create(
+                    body=file_metadata,
+                    media_body=media,
+                    fields='id'
+                ).execute(http=self._thread_http())
             print(f"File '{file_name}' uploaded with ID: {file.get('id')}")
             return file.get('id')
         except Exception as e:
@@ -113,9 +169,11 @@ class SavingOnDrive:
             if not folder_id:
                 folder_id = self.create_folder(yesterday)
             
-            # Upload each file to the designated folder
-            for file_name in files:
-                self.upload_file(file_name, folder_id)
+            # Upload the files in parallel; each upload is an independent, network-bound request.
+            # (Drive's batch endpoint can't carry media uploads, so new_batch_http_request() doesn't help here.)
+            workers = max(1, min(self.max_upload_workers, len(files)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda file_name: self.upload_file(file_name, folder_id), files))
             
             print(f"All files uploaded successfully to Google Drive folder '{yesterday}'.")
         except Exception as e:
@@ -1,26 +1,162 @@
 # Import necessary libraries
 import asyncio
-import pandas as pd
+import xlsxwriter
 import os
-import json
+try:
+    from orjson import loads as json_loads  # Faster JSON parsing when available
+except ImportError:
+    from json import loads as json_loads
+import io
 import logging
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from pathlib import Path
-from playwright.async_api import async_playwright
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload, build_http
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.errors import HttpError
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, retry_if_exception
 import socket
 import ssl
-from DetailsScraper import DetailsScraping
+import aiohttp
+from urllib.parse import urljoin
+from selectolax.parser import HTMLParser
+from playwright.async_api import Error as PlaywrightError  # Error also covers TimeoutError
+from DetailsScraper import DetailsScraping, launch_context
+from PagePool import PagePool
+from DetailCache import DetailCache
+from CardWriter import cell_value  # Same cell conversion as normal_code_main's sheets
+
+def _configure_logging():
+    # Configure logging to both console and file, once per process
+    root = logging.getLogger()
+    if not root.handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s - %(levelname)s - %(message)s",
+            handlers=[logging.StreamHandler(), logging.FileHandler("scraper.log")]
+        )
+    logging.getLogger(__name__).setLevel(logging.INFO)
+
+_configure_logging()
+
+# Google Drive API scope used by every scraper
+DRIVE_SCOPES = ['https://www.googleapis.com/auth/drive']
+
+# Drive API statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _is_retryable_http_error(error):
+    return isinstance(error, HttpError) and error.resp.status in RETRYABLE_STATUSES
+
+# Shared retry policy for Drive calls: network errors plus retryable HTTP statuses
+_RETRY = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1, min=2, max=30),
+    retry=(retry_if_exception_type((socket.error, ssl.SSLError, ConnectionError))
+           | retry_if_exception(_is_retryable_http_error)),
+)
+
+# Drive folder ids resolved during this run, keyed by (parent folder id, folder name)
+_FOLDER_ID_CACHE = {}
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Sent on plain HTTP fetches of category pages
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36')
+
+
+def http_session():
+    # Keep-alive connection pool for plain HTTP fetches, meant to be shared by all scrapers of a run
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=30),
+        headers={'User-Agent': USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=30),
+    )
+
+def drive_credentials(credentials_dict, scopes=DRIVE_SCOPES):
+    # Service account credentials, loaded once per run and shared by the Drive client and every upload thread
+    return Credentials.from_service_account_info(credentials_dict, scopes=scopes)
+
+def build_drive_service(creds):
+    # Build the Drive client once per run; the discovery document ships with googleapiclient,
+    # so no network fetch is needed and the file cache is skipped
+    return build('drive', 'v3', credentials=creds, cache_discovery=False, static_discovery=True)
+
+# Characters dropped from sheet names (keeps Unicode letters/digits, e.g. Arabic brand titles)
+_SHEET_RE = re.compile(r'[\W_]')
+
+def merge_configs(configs):
+    # Collapse configs sharing a URL so each category is scraped once:
+    # union of their specific_brands, largest specific_pages
+    merged = {}
+    for config in configs:
+        entry = merged.setdefault(config["url"], {"url": config["url"], "specific_brands": [], "specific_pages": 0})
+        for brand in config["specific_brands"] or []:
+            if brand not in entry["specific_brands"]:
+                entry["specific_brands"].append(brand)
+        entry["specific_pages"] = max(entry["specific_pages"], config["specific_pages"])
+    for entry in merged.values():
+        entry["specific_brands"] = entry["specific_brands"] or None
+    return list(merged.values())
+
+
+def _unique_sheet_name(brand_title, used):
+    # Excel sheet names: max 31 chars and unique case-insensitively; clashes get a _2, _3... suffix
+    base = _SHEET_RE.sub('', brand_title)[:31] or 'Sheet'
+    name, n = base, 1
+    while name.lower() in used:
+        n += 1
+        suffix = f"_{n}"
+        name = base[:31 - len(suffix)] + suffix
+    used.add(name.lower())
+    return name
+
+
+def _write_excel(brand_data, yesterday):
+    # Runs in a worker process: keep each brand's cars published yesterday and write one sheet per brand.
+    # Returns (workbook bytes or None when nothing matched, [(brand_title, rows) for every sheet]).
+    sheets = []
+    for brand in brand_data:
+        # "YYYY-MM-DD HH:MM:SS" date prefix
+        yesterday_cars = [car for car in brand['available_cars']
+                          if str(car.get('date_published') or '')[:10] == yesterday]
+        if yesterday_cars:
+            sheets.append((brand['brand_title'], yesterday_cars))
+
+    content = None
+    if sheets:
+        # Rows go straight to xlsxwriter, built in memory so nothing touches the disk
+        buffer = io.BytesIO()
+        # Links stay plain text, as in normal_code_main's CardWriter
+        workbook = xlsxwriter.Workbook(buffer, {'in_memory': True, 'strings_to_urls': False})
+        used_names = set()
+        try:
+            for brand_title, cars in sheets:
+                worksheet = workbook.add_worksheet(_unique_sheet_name(brand_title, used_names))
+                columns = list(dict.fromkeys(key for car in cars for key in car))  # Keys in first-seen order
+                worksheet.write_row(0, 0, columns)
+                for row, car in enumerate(cars, 1):
+                    worksheet.write_row(row, 0, [cell_value(car.get(column)) for column in columns])
+        finally:
+            workbook.close()
+        content = buffer.getvalue()
+    return content, [(brand_title, len(cars)) for brand_title, cars in sheets]
+
 
 class HierarchialMainScraper:
-    def __init__(self, credentials_dict, url, num_pages=1, specific_brands=None, specific_pages=None):
+    def __init__(self, credentials_dict, url, num_pages=1, specific_brands=None, specific_pages=None, context=None, session=None,
+                 excel_pool=None, service=None, pool=None, creds=None, detail_cache=None):
         # === Google Drive config ===
         self.credentials_dict = credentials_dict  # Dictionary loaded from service account JSON
-        self.scopes = ['https://www.googleapis.com/auth/drive']  # Required Drive API scope
-        self.service = None  # Google Drive service client (initialized later)
+        self.scopes = DRIVE_SCOPES  # Required Drive API scope
+        self.creds = creds  # Service account credentials shared across configs (loaded on demand if not given)
+        self.service = service  # Google Drive service client shared across configs (built on demand if not given)
+        self._local = threading.local()  # Per-thread state (each upload thread gets its own HTTP transport)
         self.parent_folder_id = '1NqWSVrV95XdnCbZ5MCqVR-4O2JxCF3Up'  # Parent folder to upload to
 
         # === Scraping config ===
@@ -29,43 +165,43 @@ class HierarchialMainScraper:
         self.specific_brands = specific_brands or []  # List of brands needing extra scraping
         self.specific_pages = specific_pages if specific_pages else num_pages
         self.data = []  # To store all scraped data
+        self.context = context  # Browser context shared across configs; one is launched per call if not given
+        self.session = session  # Shared aiohttp session; a temporary one is opened per fetch if not given
+        self.pool = pool  # Card detail tabs shared across configs; each page opens its own if not given
+        self.detail_cache = detail_cache  # Card detail scrapes shared across configs; each page keeps its own if not given
+        self.excel_pool = excel_pool  # Shared ProcessPoolExecutor for Excel writes (None = default thread pool)
+        self.brand_selector = '.styles_itemWrapper__MTzPB a'  # Brand card links on the category page
 
         # === Internal settings ===
         self.chunk_size = 2  # Not currently used, possibly for future concurrency
-        self.max_concurrent_links = 2  # Same as above
-        self.logger = logging.getLogger(__name__)  # Set up logger
-        self.setup_logging()  # Log setup
-        self.temp_dir = Path("temp_files")  # Temp dir for local Excel files
-        self.temp_dir.mkdir(exist_ok=True)
+        self.max_concurrent_links = 2  # Brand pages scraped at the same time
+        self.logger = logging.getLogger(__name__)  # Module logger (handlers configured once at import)
         self.upload_retries = 3  # Retry attempts for Drive uploads
         self.upload_retry_delay = 15  # Delay between retries
+        self.resumable_threshold = 5 * 1024 * 1024  # Files above this size (bytes) use resumable uploads
         self.page_delay = 3  # Seconds between scraping brand pages
         self.chunk_delay = 10  # Delay between chunks
 
-    def setup_logging(self):
-        # Configure logging to both console and file
-        stream_handler = logging.StreamHandler()
-        file_handler = logging.FileHandler("scraper.log")
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-            handlers=[stream_handler, file_handler]
-        )
-        self.logger.setLevel(logging.INFO)
-
     def authenticate(self):
-        # Authenticate with Google Drive using the provided credentials
+        # Authenticate with Google Drive using the provided credentials (no-op when shared ones were given)
+        if self.service is not None and self.creds is not None:
+            return
         try:
-            creds = Credentials.from_service_account_info(self.credentials_dict, scopes=self.scopes)
-            self.service = build('drive', 'v3', credentials=creds)
+            if self.creds is None:
+                self.creds = drive_credentials(self.credentials_dict, self.scopes)
+            if self.service is None:
+                self.service = build_drive_service(self.creds)
         except Exception as e:
             self.logger.error(f"Authentication error: {e}")
             raise
 
     # Retry wrapper for folder lookup
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
-           retry=retry_if_exception_type((socket.error, ssl.SSLError, ConnectionError)))
+    @_RETRY
     def get_folder_id(self, folder_name):
+        # Every config uploads to the same date folder, so only the first lookup hits Drive
+        cached = _FOLDER_ID_CACHE.get((self.parent_folder_id, folder_name))
+        if cached:
+            return cached
         try:
             # Query Drive for folder by name inside parent folder
             query = (f"name='{folder_name}' and "
@@ -75,14 +211,14 @@ class HierarchialMainScraper:
             files = results.get('files', [])
             if files:
                 self.logger.info(f"Found folder: {folder_name}")
+                _FOLDER_ID_CACHE[(self.parent_folder_id, folder_name)] = files[0]['id']
                 return files[0]['id']
             return None
         except Exception as e:
             self.logger.error(f"Error getting folder ID: {e}")
             raise
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
-           retry=retry_if_exception_type((socket.error, ssl.SSLError, ConnectionError)))
+    @_RETRY
     def create_folder(self, folder_name):
         # Create new folder in Drive under parent_folder_id
         try:
@@ -93,6 +229,7 @@ class HierarchialMainScraper:
             }
             folder = self.service.files().create(body=file_metadata, fields='id, name').execute()
             self.logger.info(f"Created folder: {folder_name}")
+            _FOLDER_ID_CACHE[(self.parent_folder_id, folder_name)] = folder.get('id')
             return folder.get('id')
         except Exception as e:
             self.logger.error(f"Error creating folder: {e}")
@@ -100,108 +237,169 @@ class HierarchialMainScraper:
 
     async def scrape_brands_and_types(self):
         # Scrape each brand listed on the electronics page
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(self.url)
-            
-            # Get all brand card links
-            brand_elements = await page.query_selector_all('.styles_itemWrapper__MTzPB a')
-            if not brand_elements:
-                self.logger.info(f"No brand elements found on {self.url}")
-                return self.data
-
-            # Loop through all found brands
-            for element in brand_elements:
-                title = await element.get_attribute('title')
-                brand_link = await element.get_attribute('href')
-
-                if brand_link:
-                    base_url = self.url.split('/', 3)[0] + '//' + self.url.split('/', 3)[2]
-                    full_brand_link = base_url + brand_link if brand_link.startswith('/') else brand_link
-
-                    # Use more pages for certain brands
-                    pages_to_scrape = self.specific_pages if title in self.specific_brands else self.num_pages
-                    brand_data = []
-
-                    for page_num in range(1, pages_to_scrape + 1):
-                        paginated_link = f"{full_brand_link}/{page_num}"
-                        try:
-                            # Scrape the specific page
-                            details_scraper = DetailsScraping(paginated_link)
-                            card_details = await details_scraper.get_card_details()
-                            if card_details:
-                                brand_data.extend(card_details)
-                            else:
-                                break  # Stop if no data (to avoid empty pages)
-                        except Exception as e:
-                            self.logger.error(f"Error scraping {paginated_link}: {e}")
-                            break
-
-                    # Save this brand's results
-                    self.data.append({
-                        'brand_title': title,
-                        'brand_link': full_brand_link.rsplit('/', 1)[0] + '/{}',
-                        'available_cars': brand_data
-                    })
-
-            await browser.close()
+        if self.context is None:
+            # Standalone use: launch one browser for this category
+            async with launch_context() as context:
+                self.context = context
+                try:
+                    return await self.scrape_brands_and_types()
+                finally:
+                    self.context = None
+
+        # Get all brand card links; the grid is server-rendered, so plain HTTP usually suffices
+        brand_elements = await self.fetch_brand_links()
+        if not brand_elements:
+            brand_elements = await self.browser_brand_links()
+        if not brand_elements:
+            self.logger.info(f"No brand elements found on {self.url}")
             return self.data
 
-    async def save_to_excel(self, category_name: str, brand_data: list) -> str:
-        # Save the scraped results to an Excel file
+        # Resolve every brand link and how many pages it needs
+        brands = []
+        for title, brand_link in brand_elements:
+            if brand_link:
+                full_brand_link = urljoin(self.url, brand_link)  # Handles relative and absolute hrefs
+
+                # Use more pages for certain brands
+                pages_to_scrape = self.specific_pages if title in self.specific_brands else self.num_pages
+                brands.append((title, full_brand_link, range(1, pages_to_scrape + 1)))
+
+        # Brands run concurrently, but each brand walks its pages in order so it can stop early;
+        # at most max_concurrent_links pages load at a time
+        semaphore = asyncio.Semaphore(self.max_concurrent_links)
+        self.data.extend(await asyncio.gather(
+            *(self._scrape_brand(semaphore, title, full_brand_link, pages_range)
+              for title, full_brand_link, pages_range in brands)
+        ))
+
+        return self.data
+
+    async def fetch_brand_links(self):
+        # Fetch the category page without a browser and return (title, href) of each brand card
+        session = self.session or http_session()
+        try:
+            async with session.get(self.url) as response:
+                response.raise_for_status()
+                html = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.warning(f"HTTP fetch of {self.url} failed, falling back to the browser: {e}")
+            return []
+        finally:
+            if session is not self.session:
+                await session.close()
+        return [(node.attributes.get('title'), node.attributes.get('href'))
+                for node in HTMLParser(html).css(self.brand_selector)]
+
+    async def browser_brand_links(self):
+        # Fallback when the brand grid is only rendered client-side
+        # (images, fonts, media and CSS are already aborted by the context's route handler)
+        page = await self.context.new_page()
+        try:
+            # Return as soon as the response starts; the grid selector is the real barrier (it renders client-side)
+            await page.goto(self.url, wait_until="commit", timeout=15000)
+            await page.wait_for_selector(self.brand_selector, state="attached")
+            brand_elements = await page.query_selector_all(self.brand_selector)
+            return [(await element.get_attribute('title'), await element.get_attribute('href'))
+                    for element in brand_elements]
+        except PlaywrightError as e:
+            # A slow or missing grid only loses this category, not the whole run
+            self.logger.error(f"Browser fallback for {self.url} found no brand grid: {e}")
+            return []
+        finally:
+            await page.close()
+
+    async def _scrape_brand(self, semaphore, title, full_brand_link, pages_range):
+        # Scrape one brand page by page, stopping at the first failed, empty or repeated page
+        brand_data = []
+        prev_hash = None
+        for page_num in pages_range:
+            paginated_link = f"{full_brand_link}/{page_num}"
+            try:
+                card_details = await self._scrape_page(semaphore, paginated_link)
+            except Exception as e:
+                self.logger.error(f"Error scraping {paginated_link}: {e}")
+                break
+            if not card_details:
+                break  # Past the last page; later ones would only time out the same way
+            # Out-of-range page numbers may serve the last real page again
+            page_hash = hash(frozenset(card.get('id') or card.get('link') for card in card_details))
+            if page_hash == prev_hash:
+                break
+            prev_hash = page_hash
+            brand_data.extend(card_details)
+
+        # This brand's results
+        return {
+            'brand_title': title,
+            'brand_link': full_brand_link.rsplit('/', 1)[0] + '/{}',
+            'available_cars': brand_data
+        }
+
+    async def _scrape_page(self, semaphore, paginated_link):
+        # Scrape one paginated brand page once a concurrency slot is free
+        async with semaphore:
+            details_scraper = DetailsScraping(paginated_link, context=self.context, pool=self.pool,
+                                              detail_cache=self.detail_cache)
+            return [card async for card in details_scraper.get_card_details()]
+
+    async def save_to_excel(self, category_name: str, brand_data: list) -> bytes:
+        # Build the Excel workbook for the scraped results in memory and return its bytes
         if not brand_data:
             self.logger.info(f"No data to save for {category_name}")
             return None
 
-        excel_file = Path(f"{category_name}.xlsx")
         yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
         try:
-            with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-                sheets_created = False
-
-                for brand in brand_data:
-                    brand_title = brand['brand_title']
-                    cars = brand['available_cars']
-
-                    # Filter to only cars published yesterday
-                    yesterday_cars = [
-                        car for car in cars 
-                        if car.get('date_published') and car['date_published'].split()[0] == yesterday
-                    ]
-
-                    if yesterday_cars:
-                        df = pd.DataFrame(yesterday_cars)
-                        sheet_name = "".join(x for x in brand_title if x.isalnum())[:31]  # Sheet name max length = 31
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                        sheets_created = True
-                        self.logger.info(f"Created sheet for {brand_title} with {len(yesterday_cars)} entries")
-
-                if not sheets_created:
-                    self.logger.info("No data from yesterday found for any brand")
-                    return None
-
-            self.logger.info(f"Successfully saved data for {category_name}")
-            return str(excel_file)
+            # Serialize in a worker process so the event loop keeps scraping/uploading meanwhile
+            loop = asyncio.get_running_loop()
+            content, sheets = await loop.run_in_executor(self.excel_pool, _write_excel, brand_data, yesterday)
         except Exception as e:
-            self.logger.error(f"Error saving Excel file {excel_file}: {e}")
+            self.logger.error(f"Error building Excel workbook for {category_name}: {e}")
             return None
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
-           retry=retry_if_exception_type((socket.error, ssl.SSLError, ConnectionError)))
-    def upload_file(self, file_name: str, folder_id: str) -> str:
-        # Upload the given file to the specified Drive folder
+        for brand_title, rows in sheets:
+            self.logger.info(f"Created sheet for {brand_title} with {rows} entries")
+        if not sheets:
+            self.logger.info("No data from yesterday found for any brand")
+            return None
+
+        self.logger.info(f"Successfully saved data for {category_name}")
+        return content
+
+    def _thread_http(self):
+        # httplib2 is not thread-safe, so each upload thread gets its own transport over the shared credentials;
+        # build_http() keeps googleapiclient's defaults (60 s socket timeout, 308 not followed as a redirect)
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self.creds, http=build_http())
+        return http
+
+    @_RETRY
+    def upload_file(self, file_name: str, folder_id: str, content: bytes = None) -> str:
+        # Upload the given file (or in-memory content stored under that name) to the specified Drive folder
         try:
-            if not os.path.exists(file_name):
+            if content is None and not os.path.exists(file_name):
                 raise FileNotFoundError(f"Local file not found: {file_name}")
 
             file_metadata = {
                 'name': os.path.basename(file_name),
                 'parents': [folder_id]
             }
-            media = MediaFileUpload(file_name, resumable=True)
-            file = self.service.files().create(body=file_metadata, media_body=media, fields='id').execute()
+            # Small workbooks go up in a single multipart request; resumable sessions cost an extra round trip
+            size = len(content) if content is not None else os.path.getsize(file_name)
+            resumable = size > self.resumable_threshold
+            chunksize = 8 * 1024 * 1024 if resumable else -1
+            if content is not None:
+                # Fresh stream per attempt so retries start from the first byte
+                media = MediaIoBaseUpload(io.BytesIO(content), mimetype=XLSX_MIMETYPE,
+                                          resumable=resumable, chunksize=chunksize)
+            else:
+                media = MediaFileUpload(file_name, resumable=resumable, chunksize=chunksize)
+            self.authenticate()
+            # Request built from the shared client, sent over this thread's own transport
+            request = self.service.files().create(body=file_metadata, media_body=media, fields='id')
+            file = request.execute(http=self._thread_http())
             return file.get('id')
         except Exception as e:
             self.logger.error(f"Error uploading file {file_name}: {e}")
@@ -209,7 +407,6 @@ class HierarchialMainScraper:
 
     async def process_hierarchial_electronics(self):
         # Main entry point for one category (e.g., Cameras, Consoles)
-        self.temp_dir.mkdir(exist_ok=True)
         try:
             self.authenticate()
             yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
@@ -234,12 +431,11 @@ class HierarchialMainScraper:
                     filename = "محلات الإلكترونيات"
 
                 # Save and upload
-                excel_file = await self.save_to_excel(filename, brand_data)
-                if excel_file:
-                    file_id = self.upload_file(excel_file, folder_id)
+                content = await self.save_to_excel(filename, brand_data)
+                if content:
+                    file_id = await asyncio.to_thread(  # Don't block other configs
+                        self.upload_file, f"{filename}.xlsx", folder_id, content)
                     self.logger.info(f"Successfully uploaded file with ID: {file_id}")
-                    os.remove(excel_file)
-                    self.logger.info(f"Cleaned up local file: {excel_file}")
 
         except Exception as e:
             self.logger.error(f"Error in process_hierarchial_electronics: {e}")
@@ -250,7 +446,7 @@ if __name__ == "__main__":
     if not credentials_json:
         raise EnvironmentError("ELECTRONICS_GCLOUD_KEY_JSON environment variable not found")
     
-    credentials_dict = json.loads(credentials_json)
+    credentials_dict = json_loads(credentials_json)
     
     # Electronics configurations
     configs = [
@@ -275,16 +471,39 @@ if __name__ == "__main__":
             "specific_pages": 1
         }
     ]
+    configs = merge_configs(configs)  # Guard against the same category being listed twice
+
+    max_concurrent_configs = 2  # Categories processed at the same time (keeps Drive writes well under quota)
 
     async def process_all():
-        for config in configs:
-            scraper = HierarchialMainScraper(
-                credentials_dict=credentials_dict,
-                url=config["url"],
-                num_pages=1,
-                specific_brands=config["specific_brands"],
-                specific_pages=config["specific_pages"]
-            )
-            await scraper.process_hierarchial_electronics()
+        # One Drive client, browser, HTTP connection pool and Excel worker pool for every config
+        creds = drive_credentials(credentials_dict)
+        service = build_drive_service(creds)
+        detail_cache = DetailCache(max_size=2048)  # Card URLs repeat across sibling brands and configs
+        semaphore = asyncio.Semaphore(max_concurrent_configs)
+
+        async def run_config(config, context, session, excel_pool, pool):
+            async with semaphore:
+                scraper = HierarchialMainScraper(
+                    credentials_dict=credentials_dict,
+                    url=config["url"],
+                    num_pages=1,
+                    specific_brands=config["specific_brands"],
+                    specific_pages=config["specific_pages"],
+                    context=context,
+                    session=session,
+                    excel_pool=excel_pool,
+                    service=service,
+                    pool=pool,
+                    creds=creds,
+                    detail_cache=detail_cache
+                )
+                await scraper.process_hierarchial_electronics()
+
+        with ProcessPoolExecutor(max_workers=len(configs)) as excel_pool:
+            async with launch_context() as context, http_session() as session:
+                pool = PagePool(context, max_pages=8)  # Bounds detail tabs across all configs and pages
+                # Folder lookup runs before the first await of each pipeline, so only the first config hits Drive
+                await asyncio.gather(*(run_config(config, context, session, excel_pool, pool) for config in configs))
 
     asyncio.run(process_all())
@@ -1,29 +1,58 @@
 # Import required libraries
 import asyncio
-import pandas as pd
 import os
 import json
 import logging
+import random
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 from pathlib import Path
-from DetailsScraper import DetailsScraping  # Scraper for individual listing pages
+from googleapiclient.errors import HttpError
+from DetailsScraper import DetailsScraping, launch_context  # Listing scraper + shared browser helpers
+from PagePool import PagePool
+from DetailCache import DetailCache
+from CardWriter import CardWriter, SUFFIXES  # Streams cards into the output file
 from SavingOnDrive import SavingOnDrive  # Google Drive helper for saving files
 
 
+# Path separators (and ':') are not allowed in file names
+_SAFE_TABLE = str.maketrans({'/': '_', '\\': '_', ':': '_'})
+
+
+def _file_sizes(files):
+    # Local size of each file, or None when it is missing (one stat call per file)
+    sizes = {}
+    for file in files:
+        try:
+            sizes[file] = os.stat(file).st_size
+        except FileNotFoundError:
+            sizes[file] = None
+    return sizes
+
+
 class ElectronicsMainScraper:
-    def __init__(self, electronics_data: Dict[str, List[Tuple[str, int]]]):
-        self.electronics_data = electronics_data  # Dictionary with category name → [(URL template, number of pages)]
-        self.chunk_size = 2  # Number of categories to process at a time
+    def __init__(self, electronics_data: Dict[str, List[Tuple]]):
+        # Dictionary with category name → [(URL template, number of pages[, newest_first])]; newest_first=True lets a
+        # template whose page 1 already reaches listings older than yesterday skip its later pages
+        self.electronics_data = electronics_data
         self.max_concurrent_links = 2  # Maximum concurrent category scrapes
         self.logger = logging.getLogger(__name__)  # Logger instance
         self.setup_logging()  # Configure logging
-        self.temp_dir = Path("temp_files")  # Directory to save temporary Excel files
+        self.temp_dir = Path("temp_files")  # Directory to save temporary output files
+        self.output_format = "xlsx"  # "xlsx" for Excel sheets, "jsonl" for gzipped JSON Lines (far cheaper to write)
         self.temp_dir.mkdir(exist_ok=True)
         self.upload_retries = 3  # Retry count for Drive upload
         self.upload_retry_delay = 15  # Seconds to wait before retrying upload
-        self.page_delay = 3  # Delay between page requests
-        self.chunk_delay = 10  # Delay between chunk batches
+        self.max_concurrent_uploads = 4  # Drive uploads in flight at once (stays under the per-user write cap)
+        self.upload_semaphore = asyncio.Semaphore(self.max_concurrent_uploads)  # Shared by all categories' uploads
+        self.page_semaphore = asyncio.Semaphore(6)  # Listing pages loading at once across all categories
+        self.context = None  # Browser context shared by all DetailsScraping instances (set per run)
+        self.page_pool = None  # Card detail tabs shared by all pages, bounding total open tabs (set per run)
+        self.detail_cache = None  # Bounded card URL -> detail scrape cache shared by all pages (set per run)
+        self.yesterday = None  # "YYYY-MM-DD" the run collects listings for (set per run)
+        self.drive_saver = None  # Authenticated Drive helper shared by every upload of the run
+        self.folder_id = None  # Yesterday's Drive folder, resolved once per run
 
     def setup_logging(self):
         """Initialize logging configuration."""
@@ -37,93 +66,147 @@ class ElectronicsMainScraper:
         self.logger.setLevel(logging.INFO)
         print("Logging setup complete.")
 
-    async def scrape_electronic(self, electronic_name: str, urls: List[Tuple[str, int]], semaphore: asyncio.Semaphore) -> List[Dict]:
-        """Scrape data for a single category (with semaphore limiting concurrency)."""
-        self.logger.info(f"Starting to scrape {electronic_name}")
-        card_data = []
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")  # Filter date
-
-        async with semaphore:
-            for url_template, page_count in urls:
-                for page in range(1, page_count + 1):
-                    url = url_template.format(page)  # Format the URL for current page
-                    scraper = DetailsScraping(url)  # Create scraping instance
-                    try:
-                        cards = await scraper.get_card_details()  # Scrape listing cards
-                        for card in cards:
-                            # Filter for only yesterday's listings
-                            if card.get("date_published") and card.get("date_published", "").split()[0] == yesterday:
-                                card_data.append(card)
-                        await asyncio.sleep(self.page_delay)  # Respectful delay between pages
-                    except Exception as e:
-                        self.logger.error(f"Error scraping {url}: {e}")
-                        continue
-        return card_data
+    async def _process_category(self, electronic_name: str, urls: List[Tuple], semaphore: asyncio.Semaphore):
+        """Scrape one category, upload its file as soon as it is ready, then remove the local copy."""
+        try:
+            excel_file = await self.scrape_electronic(electronic_name, urls, semaphore)
+            if not excel_file:
+                return
+            await self.upload_files_with_retry(self.drive_saver, [excel_file], self.folder_id)
+        except Exception as e:
+            self.logger.error("Error processing %s: %s", electronic_name, e)
+            return
 
-    async def save_to_excel(self, electronic_name: str, card_data: List[Dict]) -> str:
-        """Save scraped data to an Excel file."""
-        if not card_data:
-            self.logger.info(f"No data to save for {electronic_name}, skipping Excel file creation.")
-            return None
+        # Cleanup local file; only failures are worth a log line
+        try:
+            Path(excel_file).unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.warning("Cleanup failed for %s: %s", excel_file, e)
+
+    async def scrape_electronic(self, electronic_name: str, urls: List[Tuple], semaphore: asyncio.Semaphore) -> str:
+        """Scrape a single category straight into its Excel file (with semaphore limiting concurrency)."""
+        self.logger.info("Starting to scrape %s", electronic_name)
+        safe_name = electronic_name.translate(_SAFE_TABLE)  # Sanitize filename
+        writer = CardWriter(self.temp_dir / f"{safe_name}{SUFFIXES[self.output_format]}", self.output_format)  # Matching cards become rows as soon as they are scraped
 
-        safe_name = electronic_name.replace('/', '_').replace('\\', '_')  # Sanitize filename
-        excel_file = Path(f"{safe_name}.xlsx")
         try:
-            df = pd.DataFrame(card_data)  # Convert to DataFrame
-            df.to_excel(excel_file, index=False)  # Save to Excel
-            self.logger.info(f"Successfully saved data for {electronic_name}")
-            return str(excel_file)
-        except Exception as e:
-            self.logger.error(f"Error saving Excel file {excel_file}: {e}")
+            async with semaphore:
+                # Templates flagged newest_first scrape page 1 first: once it already reaches (non-pinned)
+                # listings older than yesterday, their later pages can't hold any of yesterday's.
+                # Every other template has all its pages scraped, whatever order the site lists them in
+                newest_first, page_urls = [], []
+                for url_template, page_count, *flags in urls:
+                    if flags and flags[0]:
+                        newest_first.append((url_template, page_count))
+                    else:
+                        page_urls.extend(url_template.format(page) for page in range(1, page_count + 1))
+
+                first_urls = [url_template.format(1) for url_template, _ in newest_first]
+                firsts = await asyncio.gather(*(self._scrape_page(url, writer) for url in first_urls), return_exceptions=True)
+                for (url_template, page_count), url, result in zip(newest_first, first_urls, firsts):
+                    if isinstance(result, Exception):
+                        self.logger.error("Error scraping %s: %s", url, result)
+                    elif result and page_count > 1:
+                        self.logger.info("Listings on %s are already older than %s, skipping its %d later pages",
+                                         url, self.yesterday, page_count - 1)
+                        continue
+                    page_urls.extend(url_template.format(page) for page in range(2, page_count + 1))
+
+                # Remaining pages all at once; the page semaphore caps listing pages on the host
+                pages = await asyncio.gather(*(self._scrape_page(url, writer) for url in page_urls), return_exceptions=True)
+                for url, result in zip(page_urls, pages):
+                    if isinstance(result, Exception):
+                        self.logger.error("Error scraping %s: %s", url, result)
+        finally:
+            excel_file = await asyncio.to_thread(writer.close)  # Final flush and zip off the event loop
+
+        if not excel_file:
+            self.logger.info("No data to save for %s, skipping Excel file creation.", electronic_name)
             return None
+        self.logger.info("Successfully saved %s rows for %s", writer.rows, electronic_name)
+        return excel_file
+
+    async def _scrape_page(self, url: str, writer: CardWriter) -> bool:
+        """Scrape one listing page and write yesterday's cards; returns True if it reached older listings."""
+        reached_older = False
+        async with self.page_semaphore:
+            # Reuses the run's browser, tabs and detail cache
+            scraper = DetailsScraping(url, context=self.context, pool=self.page_pool, detail_cache=self.detail_cache)
+            # Cards stream in one by one and go straight to the sheet; only the bounded detail cache stays in memory
+            async for card in scraper.get_card_details():
+                # "YYYY-MM-DD HH:MM:SS": compare the date prefix without splitting
+                if not (published := card.get("date_published")):
+                    continue
+                if published[:10] == self.yesterday:
+                    writer.write(card)
+                elif published[:10] < self.yesterday and card.get("pin") == "Not Pinned":
+                    reached_older = True  # Pinned cards can be old, so only regular ones count
+        return reached_older
 
-    async def upload_files_with_retry(self, drive_saver, files: List[str]) -> List[str]:
-        """Upload files to Google Drive with retry mechanism."""
+    def _upload_retry_wait(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying: Drive's Retry-After on 429, else exponential backoff with jitter."""
+        if isinstance(error, HttpError) and error.resp.status == 429:
+            retry_after = str(error.resp.get('retry-after', '')).strip()
+            if retry_after.isdigit():
+                return int(retry_after)
+        return min(60, self.upload_retry_delay * 2 ** attempt) + random.uniform(0, 1)
+
+    def _sync_upload_with_retry(self, drive_saver, file: str, folder_id: str) -> str:
+        """Upload one file with retries; blocking, meant to run in a worker thread."""
+        for attempt in range(self.upload_retries):
+            try:
+                file_id = drive_saver.upload_file(file, folder_id)  # Upload file
+                if not file_id:
+                    raise Exception("Upload returned no file ID")
+                self.logger.info("Successfully uploaded %s with ID: %s", file, file_id)
+                return file
+            except Exception as e:
+                self.logger.error("Upload attempt %s failed for %s: %s", attempt + 1, file, e)
+                if attempt < self.upload_retries - 1:
+                    delay = self._upload_retry_wait(e, attempt)
+                    self.logger.info("Retrying after %.1f seconds...", delay)
+                    time.sleep(delay)
+                    if isinstance(e, HttpError) and e.resp.status in (401, 403):
+                        drive_saver.authenticate()  # Only credential errors need a fresh token
+                else:
+                    self.logger.error("Failed to upload %s after %s attempts", file, self.upload_retries)
+        return None
+
+    async def upload_files_with_retry(self, drive_saver, files: List[str], folder_id: str) -> List[str]:
+        """Upload files to the given Google Drive folder with retry mechanism."""
         uploaded_files = []
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
         try:
-            self.logger.info(f"Checking local files before upload: {files}")
-            for file in files:
-                self.logger.info(f"File {file} exists: {os.path.exists(file)}, size: {os.path.getsize(file) if os.path.exists(file) else 'N/A'}")
+            self.logger.info("Checking local files before upload: %s", files)
+            sizes = await asyncio.to_thread(_file_sizes, files)  # All stat calls in one worker hop
+            for file, size in sizes.items():
+                self.logger.info("File %s exists: %s, size: %s", file, size is not None, size if size is not None else 'N/A')
+                if size is None:
+                    self.logger.error("File not found for upload: %s", file)
 
-            folder_id = drive_saver.get_folder_id(yesterday)  # Find yesterday's folder
-            if not folder_id:
-                self.logger.info(f"Creating new folder for date: {yesterday}")
-                folder_id = drive_saver.create_folder(yesterday)  # Create if not exist
-                if not folder_id:
-                    raise Exception("Failed to create or get folder ID")
-                self.logger.info(f"Created new folder '{yesterday}' with ID: {folder_id}")
-
-            for file in files:
-                for attempt in range(self.upload_retries):
-                    try:
-                        if os.path.exists(file):
-                            file_id = drive_saver.upload_file(file, folder_id)  # Upload file
-                            if not file_id:
-                                raise Exception("Upload returned no file ID")
-                            uploaded_files.append(file)
-                            self.logger.info(f"Successfully uploaded {file} with ID: {file_id}")
-                            break
-                        else:
-                            self.logger.error(f"File not found for upload: {file}")
-                            break
-                    except Exception as e:
-                        self.logger.error(f"Upload attempt {attempt + 1} failed for {file}: {e}")
-                        if attempt < self.upload_retries - 1:
-                            self.logger.info(f"Retrying after {self.upload_retry_delay} seconds...")
-                            await asyncio.sleep(self.upload_retry_delay)
-                            drive_saver.authenticate()  # Re-authenticate before retry
-                        else:
-                            self.logger.error(f"Failed to upload {file} after {self.upload_retries} attempts")
+            # Drive has no batch media upload, so overlap a few single uploads instead
+            async def upload_one(file):
+                async with self.upload_semaphore:
+                    return await asyncio.to_thread(self._sync_upload_with_retry, drive_saver, file, folder_id)
+
+            # Existence was checked once above; a file present now stays present for its retries
+            present = [file for file, size in sizes.items() if size is not None]
+            results = await asyncio.gather(*(upload_one(file) for file in present), return_exceptions=True)
+            for file, result in zip(present, results):
+                if isinstance(result, Exception):
+                    self.logger.error("Unexpected error uploading %s: %s", file, result)
+                elif result:
+                    uploaded_files.append(result)
         except Exception as e:
-            self.logger.error(f"Error in upload process: {e}")
+            self.logger.error("Error in upload process: %s", e)
             raise
 
         return uploaded_files
 
     async def scrape_all_electronics(self):
         """Main entry point to scrape and upload all electronic categories."""
+        # One date for the whole run, so a run crossing midnight filters and uploads consistently
+        self.yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
         self.temp_dir.mkdir(exist_ok=True)
 
         # Setup and authenticate Google Drive access
@@ -142,58 +225,36 @@ class ElectronicsMainScraper:
                 drive_saver.service.files().get(fileId=drive_saver.parent_folder_id).execute()
                 self.logger.info("Successfully accessed parent folder")
             except Exception as e:
-                self.logger.error(f"Failed to access parent folder: {e}")
+                self.logger.error("Failed to access parent folder: %s", e)
                 return
+
+            # Resolve yesterday's folder once; every category uploads into it
+            yesterday = self.yesterday
+            folder_id = drive_saver.get_folder_id(yesterday)  # Find yesterday's folder
+            if not folder_id:
+                self.logger.info("Creating new folder for date: %s", yesterday)
+                folder_id = drive_saver.create_folder(yesterday)  # Create if not exist
+                if not folder_id:
+                    raise Exception("Failed to create or get folder ID")
+                self.logger.info("Created new folder '%s' with ID: %s", yesterday, folder_id)
+            self.drive_saver, self.folder_id = drive_saver, folder_id
         except Exception as e:
-            self.logger.error(f"Failed to setup Google Drive: {e}")
+            self.logger.error("Failed to setup Google Drive: %s", e)
             return
 
-        # Split categories into chunks
-        electronics_chunks = [
-            list(self.electronics_data.items())[i : i + self.chunk_size]
-            for i in range(0, len(self.electronics_data), self.chunk_size)
-        ]
-
         semaphore = asyncio.Semaphore(self.max_concurrent_links)
 
-        # Process each chunk sequentially
-        for chunk_index, chunk in enumerate(electronics_chunks, 1):
-            self.logger.info(f"Processing chunk {chunk_index}/{len(electronics_chunks)}")
-
-            tasks = []
-            for electronic_name, urls in chunk:
-                task = asyncio.create_task(self.scrape_electronic(electronic_name, urls, semaphore))
-                tasks.append((electronic_name, task))
-                await asyncio.sleep(2)  # Space out task creation slightly
-
-            pending_uploads = []
-            for electronic_name, task in tasks:
-                try:
-                    card_data = await task
-                    if card_data:
-                        excel_file = await self.save_to_excel(electronic_name, card_data)
-                        if excel_file:
-                            pending_uploads.append(excel_file)
-                except Exception as e:
-                    self.logger.error(f"Error processing {electronic_name}: {e}")
-
-            # Upload Excel files
-            if pending_uploads:
-                await self.upload_files_with_retry(drive_saver, pending_uploads)
-
-                # Cleanup local files
-                for file in pending_uploads:
-                    try:
-                        os.remove(file)
-                        self.logger.info(f"Cleaned up local file: {file}")
-                    except Exception as e:
-                        self.logger.error(f"Error cleaning up {file}: {e}")
-
-            # Wait before next chunk
-            if chunk_index < len(electronics_chunks):
-                self.logger.info(f"Waiting {self.chunk_delay} seconds before next chunk...")
-                await asyncio.sleep(self.chunk_delay)
-
+        # One browser shared by every category and page of the run
+        async with launch_context() as context:
+            self.context = context
+            self.page_pool = PagePool(context, max_pages=8)
+            self.detail_cache = DetailCache(max_size=2048)
+            # Every category runs its own scrape -> upload -> cleanup pipeline; the semaphores cap the load
+            await asyncio.gather(
+                *(self._process_category(electronic_name, urls, semaphore)
+                  for electronic_name, urls in self.electronics_data.items()),
+                return_exceptions=True,
+            )
 
 # Main entry point
 if __name__ == "__main__":